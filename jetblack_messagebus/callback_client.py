@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 import asyncio
-from asyncio import Queue
 import logging
-from typing import Optional, List, Callable, Awaitable
+from typing import Any, Optional, List, Callable, Awaitable, Sequence
 from uuid import UUID
 
-from .client import Client
+from .client import Client, MAX_WRITE_BATCH_SIZE, MAX_READ_QUEUE_SIZE
 from .io import DataReader, DataWriter, DataPacket
 from .authentication import Authenticator
 
@@ -31,6 +30,19 @@ ClosedHandler = Callable[
 ]
 
 
+async def _call_handlers(
+        handlers: Sequence[Callable[..., Awaitable[None]]],
+        *args: Any
+) -> None:
+    # The handlers are independent, so they run concurrently. A single
+    # handler is awaited directly to avoid the overhead of gather.
+    count = len(handlers)
+    if count == 1:
+        await handlers[0](*args)
+    elif count > 1:
+        await asyncio.gather(*(handler(*args) for handler in handlers))
+
+
 class CallbackClient(Client):
     """Feedbus callback client"""
 
@@ -39,16 +51,23 @@ class CallbackClient(Client):
             reader: DataReader,
             writer: DataWriter,
             authenticator: Optional[Authenticator],
-            monitor_heartbeat: bool
+            monitor_heartbeat: bool,
+            *,
+            write_batch_size: int = MAX_WRITE_BATCH_SIZE,
+            max_read_queue: int = MAX_READ_QUEUE_SIZE
     ) -> None:
-        super().__init__(reader, writer, authenticator, monitor_heartbeat)
+        super().__init__(
+            reader,
+            writer,
+            authenticator,
+            monitor_heartbeat,
+            write_batch_size=write_batch_size,
+            max_read_queue=max_read_queue
+        )
         self._authorization_handlers: List[AuthorizationHandler] = list()
         self._data_handlers: List[DataHandler] = list()
         self._notification_handlers: List[NotificationHandler] = list()
         self._closed_handlers: List[ClosedHandler] = list()
-        self._read_queue: Queue = asyncio.Queue()
-        self._write_queue: Queue = asyncio.Queue()
-        self._token = asyncio.Event()
 
     @property
     def authorization_handlers(self) -> List[AuthorizationHandler]:
@@ -95,14 +114,14 @@ class CallbackClient(Client):
             feed: str,
             topic: str
     ) -> None:
-        for handler in self._authorization_handlers:
-            await handler(
-                client_id,
-                host,
-                user,
-                feed,
-                topic
-            )
+        await _call_handlers(
+            self._authorization_handlers,
+            client_id,
+            host,
+            user,
+            feed,
+            topic
+        )
 
     async def on_data(
             self,
@@ -113,15 +132,15 @@ class CallbackClient(Client):
             data_packets: Optional[List[DataPacket]],
             content_type: str
     ) -> None:
-        for handler in self._data_handlers:
-            await handler(
-                user,
-                host,
-                feed,
-                topic,
-                data_packets,
-                content_type
-            )
+        await _call_handlers(
+            self._data_handlers,
+            user,
+            host,
+            feed,
+            topic,
+            data_packets,
+            content_type
+        )
 
     async def on_forwarded_subscription_request(
             self,
@@ -132,16 +151,15 @@ class CallbackClient(Client):
             topic: str,
             is_add: bool
     ) -> None:
-        for handler in self._notification_handlers:
-            await handler(
-                client_id,
-                user,
-                host,
-                feed,
-                topic,
-                is_add
-            )
+        await _call_handlers(
+            self._notification_handlers,
+            client_id,
+            user,
+            host,
+            feed,
+            topic,
+            is_add
+        )
 
     async def on_closed(self, is_faulted: bool) -> None:
-        for handler in self._closed_handlers:
-            await handler(is_faulted)
+        await _call_handlers(self._closed_handlers, is_faulted)
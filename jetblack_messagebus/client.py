@@ -3,9 +3,12 @@
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 import asyncio
-from asyncio import Queue
+from collections import deque
 import logging
-from typing import Optional, Set, List, cast
+import socket
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, Iterator, Optional, Set, List
+)
 from ssl import SSLContext
 from uuid import UUID
 
@@ -33,6 +36,26 @@ from .utils import read_aiter
 
 LOGGER = logging.getLogger(__name__)
 
+# The default number of bytes after which queued messages stop being added
+# to a write. Draining only yields to the event loop when the transport is
+# paused, so the writer yields explicitly when messages remain queued after
+# a write, and this also bounds the work done between yields.
+MAX_WRITE_BATCH_SIZE = 65536
+
+# The default number of messages that may be queued before the reader stops
+# reading from the connection. When the handlers fall behind the unread data
+# is left with the transport, which pushes back on the distributor.
+MAX_READ_QUEUE_SIZE = 1024
+
+
+def _set_no_delay(writer: asyncio.StreamWriter) -> None:
+    # Small messages such as subscription requests must not be held back by
+    # Nagle's algorithm, as the client does its own batching. Recent event
+    # loops set this already, but not all of them do.
+    sock = writer.get_extra_info('socket')
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
 
 class Client(metaclass=ABCMeta):
     """Feedbus client"""
@@ -42,15 +65,32 @@ class Client(metaclass=ABCMeta):
             reader: DataReader,
             writer: DataWriter,
             authenticator: Optional[Authenticator],
-            monitor_heartbeat: bool
+            monitor_heartbeat: bool,
+            *,
+            write_batch_size: int = MAX_WRITE_BATCH_SIZE,
+            max_read_queue: int = MAX_READ_QUEUE_SIZE
     ):
         self._reader = reader
         self._writer = writer
         self._authenticator = authenticator
         self._monitor_heartbeat = monitor_heartbeat
-        self._read_queue: Queue = asyncio.Queue()
-        self._write_queue: Queue = asyncio.Queue()
+        self._write_batch_size = write_batch_size
+        self._max_read_queue = max_read_queue
+        # The queues are plain deques with an event to wake the consumer, as
+        # asyncio.Queue allocates a future per waiting get or put.
+        self._read_queue: Deque[Message] = deque()
+        self._read_ready = asyncio.Event()
+        self._read_space = asyncio.Event()
+        self._read_space.set()
+        self._write_queue: Deque[Message] = deque()
+        self._write_ready = asyncio.Event()
         self._token = asyncio.Event()
+        self._dispatch: Dict[MessageType, Callable[[Any], Awaitable[None]]] = {
+            MessageType.AUTHORIZATION_REQUEST: self._raise_authorization_request,
+            MessageType.FORWARDED_MULTICAST_DATA: self._raise_multicast_data,
+            MessageType.FORWARDED_UNICAST_DATA: self._raise_unicast_data,
+            MessageType.FORWARDED_SUBSCRIPTION_REQUEST: self._raise_forwarded_subscription_request,
+        }
 
     @classmethod
     async def create(
@@ -60,7 +100,9 @@ class Client(metaclass=ABCMeta):
             *,
             authenticator: Optional[Authenticator] = None,
             ssl: Optional[SSLContext] = None,
-            monitor_heartbeat: bool = False
+            monitor_heartbeat: bool = False,
+            write_batch_size: int = MAX_WRITE_BATCH_SIZE,
+            max_read_queue: int = MAX_READ_QUEUE_SIZE
     ) -> Client:
         """Create the client
 
@@ -70,6 +112,12 @@ class Client(metaclass=ABCMeta):
             authenticator (Optional[Authenticator], optional): An authenticator. Defaults to None.
             ssl (Optional[SSLContext], optional): The context for an ssl connection. Defaults to None.
             monitor_heartbeat (bool, optional): If true use the monitor heartbeat. Defaults to False.
+            write_batch_size (int, optional): The number of bytes after which
+                queued messages are sent in a further write, after yielding
+                to the event loop. Defaults to MAX_WRITE_BATCH_SIZE.
+            max_read_queue (int, optional): The number of received messages
+                waiting for the handlers at which reading stops. Defaults to
+                MAX_READ_QUEUE_SIZE.
 
         Returns:
             Client: The connected client.
@@ -78,12 +126,15 @@ class Client(metaclass=ABCMeta):
             authenticator = NullAuthenticator()
 
         reader, writer = await asyncio.open_connection(host, port, ssl=ssl)
+        _set_no_delay(writer)
 
         return cls(
             DataReader(reader),
             DataWriter(writer),
             authenticator,
-            monitor_heartbeat
+            monitor_heartbeat,
+            write_batch_size=write_batch_size,
+            max_read_queue=max_read_queue
         )
 
 
@@ -94,7 +145,9 @@ class Client(metaclass=ABCMeta):
             port: int,
             *,
             authenticator: Optional[Authenticator] = None,
-            monitor_heartbeat: bool = False
+            monitor_heartbeat: bool = False,
+            write_batch_size: int = MAX_WRITE_BATCH_SIZE,
+            max_read_queue: int = MAX_READ_QUEUE_SIZE
     ) -> Client:
         """Create the client using SSPI authentication.
 
@@ -103,6 +156,12 @@ class Client(metaclass=ABCMeta):
             port (int): The distributor port
             authenticator (Optional[Authenticator], optional): An authenticator. Defaults to None.
             monitor_heartbeat (bool, optional): If true use the monitor heartbeat. Defaults to False.
+            write_batch_size (int, optional): The number of bytes after which
+                queued messages are sent in a further write, after yielding
+                to the event loop. Defaults to MAX_WRITE_BATCH_SIZE.
+            max_read_queue (int, optional): The number of received messages
+                waiting for the handlers at which reading stops. Defaults to
+                MAX_READ_QUEUE_SIZE.
 
         Returns:
             Client: The connected client.
@@ -116,7 +175,9 @@ class Client(metaclass=ABCMeta):
             DataReader(reader), # type: ignore
             DataWriter(writer), # type: ignore
             authenticator,
-            monitor_heartbeat
+            monitor_heartbeat,
+            write_batch_size=write_batch_size,
+            max_read_queue=max_read_queue
         )
 
     async def start(self) -> None:
@@ -128,35 +189,30 @@ class Client(metaclass=ABCMeta):
         if self._monitor_heartbeat:
             await self.add_subscription('__admin__', 'heartbeat')
 
+        handle = self._handle_message
         async for message in read_aiter(self._read, self._write, self._dequeue, self._token):
-            if message.message_type == MessageType.AUTHORIZATION_REQUEST:
-                await self._raise_authorization_request(
-                    cast(AuthorizationRequest, message)
-                )
-            elif message.message_type == MessageType.FORWARDED_MULTICAST_DATA:
-                await self._raise_multicast_data(
-                    cast(ForwardedMulticastData, message)
-                )
-            elif message.message_type == MessageType.FORWARDED_UNICAST_DATA:
-                await self._raise_unicast_data(
-                    cast(ForwardedUnicastData, message)
-                )
-            elif message.message_type == MessageType.FORWARDED_SUBSCRIPTION_REQUEST:
-                await self._raise_forwarded_subscription_request(
-                    cast(ForwardedSubscriptionRequest, message)
-                )
-            else:
-                raise RuntimeError(
-                    f'Invalid message type {message.message_type}')
+            await handle(message)
 
         is_faulted = not self._token.is_set()
-        if not is_faulted:
+        if is_faulted:
+            # Messages received before the connection failed are still
+            # handled.
+            for message in self._take_read_queue():
+                await handle(message)
+        else:
             await self._writer.close()
 
         await self.on_closed(is_faulted)
 
         LOGGER.info('Done')
 
+    async def _handle_message(self, message: Message) -> None:
+        handler = self._dispatch.get(message.message_type)
+        if handler is None:
+            raise RuntimeError(
+                f'Invalid message type {message.message_type}')
+        await handler(message)
+
     def stop(self) -> None:
         """Stop handling messages"""
         self._token.set()
@@ -293,7 +349,7 @@ class Client(metaclass=ABCMeta):
             is_authorization_required (bool): If True, authorization is required.
             entitlements (Optional[Set[int]]): The entitlements of the user.
         """
-        await self._write_queue.put(
+        self._enqueue(
             AuthorizationResponse(
                 client_id,
                 feed,
@@ -318,7 +374,7 @@ class Client(metaclass=ABCMeta):
             content_type (str): The type of the message contents.
             data_packets (Optional[List[DataPacket]]): Th data packets.
         """
-        await self._write_queue.put(
+        self._enqueue(
             MulticastData(
                 feed,
                 topic,
@@ -344,7 +400,7 @@ class Client(metaclass=ABCMeta):
             content_type (str): The type of the message contents.
             data_packets (Optional[List[DataPacket]]): Th data packets.
         """
-        await self._write_queue.put(
+        self._enqueue(
             UnicastData(
                 client_id,
                 feed,
@@ -361,7 +417,7 @@ class Client(metaclass=ABCMeta):
             feed (str): The feed name.
             topic (str): The topic name.
         """
-        await self._write_queue.put(
+        self._enqueue(
             SubscriptionRequest(
                 feed,
                 topic,
@@ -376,7 +432,7 @@ class Client(metaclass=ABCMeta):
             feed (str): The feed name.
             topic (str): The topic name.
         """
-        await self._write_queue.put(
+        self._enqueue(
             SubscriptionRequest(
                 feed,
                 topic,
@@ -390,7 +446,7 @@ class Client(metaclass=ABCMeta):
         Args:
             feed (str): The feed name.
         """
-        await self._write_queue.put(
+        self._enqueue(
             NotificationRequest(
                 feed,
                 True
@@ -403,20 +459,67 @@ class Client(metaclass=ABCMeta):
         Args:
             feed (str): The feed name.
         """
-        await self._write_queue.put(
+        self._enqueue(
             NotificationRequest(
                 feed,
                 False
             )
         )
 
-    async def _read(self) -> None:
-        message = await Message.read(self._reader)
-        await self._read_queue.put(message)
+    def _enqueue(self, message: Message) -> None:
+        self._write_queue.append(message)
+        self._write_ready.set()
 
-    async def _dequeue(self) -> Message:
-        return await self._read_queue.get()
-
-    async def _write(self):
-        message = await self._write_queue.get()
-        await message.write(self._writer)
+    async def _read(self) -> None:
+        # Messages are read continuously, so the connection is read while
+        # the handlers for earlier messages run. The data reader fills its
+        # buffer in large blocks, so every message already received is read
+        # and queued without suspending, and the handlers then take the whole
+        # batch from the queue. Reading stops while the queue is full, until
+        # the handlers take the next batch.
+        read, reader = Message.read, self._reader
+        queue, space = self._read_queue, self._read_space
+        enqueue, ready = queue.append, self._read_ready.set
+        limit = self._max_read_queue
+        while True:
+            enqueue(await read(reader))
+            ready()
+            while len(queue) >= limit:
+                space.clear()
+                await space.wait()
+
+    async def _dequeue(self) -> List[Message]:
+        # Everything read so far is taken at once, so the handlers work
+        # through a batch before waiting again.
+        while not self._read_queue:
+            self._read_ready.clear()
+            await self._read_ready.wait()
+        return self._take_read_queue()
+
+    def _take_read_queue(self) -> List[Message]:
+        messages = list(self._read_queue)
+        self._read_queue.clear()
+        self._read_space.set()
+        return messages
+
+    async def _write(self) -> None:
+        while True:
+            while not self._write_queue:
+                self._write_ready.clear()
+                await self._write_ready.wait()
+            await Message.write_many(self._writer, self._write_batch())
+            if self._write_queue:
+                # The drain rarely suspends, so let the reader and handlers
+                # run before the next batch.
+                await asyncio.sleep(0)
+
+    def _write_batch(self) -> Iterator[Message]:
+        # Everything queued is sent with one write and drain. The messages
+        # are serialized as they are taken, so the batch ends once the
+        # writer holds enough.
+        yield self._write_queue.popleft()
+        while (
+                self._write_queue and
+                self._writer.buffered < self._write_batch_size
+        ):
+            yield self._write_queue.popleft()
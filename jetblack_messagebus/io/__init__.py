@@ -1,11 +1,12 @@
 """IO"""
 
-from .data_reader import DataReader
+from .data_reader import DataReader, IncompleteBufferError
 from .data_writer import DataWriter
 from .data_packet import DataPacket
 
 __all__ = [
     'DataReader',
+    'IncompleteBufferError',
     'DataWriter',
     'DataPacket'
 ]
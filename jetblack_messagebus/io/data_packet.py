@@ -1,32 +1,89 @@
 """DataPacket"""
 
-from typing import Optional, Set
+from typing import AbstractSet, Any, FrozenSet, Optional, Union
 
 
 class DataPacket:
     """A data packet"""
 
+    __slots__ = ('entitlements', '_data', '_view')
+
     def __init__(
             self,
-            entitlements: Optional[Set[int]],
-            data: Optional[bytes]
+            entitlements: Optional[AbstractSet[int]],
+            data: Optional[Union[bytes, bytearray, memoryview]]
     ) -> None:
         """Initialise a data packet.
 
+        The data may be any bytes-like object, so a memoryview over a larger
+        buffer can be sent without first being copied into bytes. The `data`
+        property always returns bytes, copying other objects when it is
+        first accessed.
+
+        Args:
+            entitlements (Optional[AbstractSet[int]]): An optional set of
+                entitlements, which is held as a frozenset.
+            data (Optional[Union[bytes, bytearray, memoryview]]): The data.
+        """
+        self.entitlements: Optional[FrozenSet[int]] = (
+            None if entitlements is None else frozenset(entitlements)
+        )
+        self._data = data
+        self._view: Optional[memoryview] = None
+
+    @classmethod
+    def from_view(
+            cls,
+            entitlements: Optional[AbstractSet[int]],
+            view: memoryview
+    ) -> 'DataPacket':
+        """Create a data packet whose data is copied out of a view over the
+        read buffer the first time it is accessed.
+
+        Handlers which only look at the feed, topic or entitlements never pay
+        for the copy.
+
         Args:
-            entitlements (Optional[Set[int]]): An optional set of entitlements.
-            data (Optional[bytes]): The data.
+            entitlements (Optional[AbstractSet[int]]): An optional set of
+                entitlements.
+            view (memoryview): A view over the data.
+
+        Returns:
+            DataPacket: The data packet.
         """
-        self.entitlements = entitlements
-        self.data = data
+        packet = cls(entitlements, None)
+        packet._view = view
+        return packet
+
+    @property
+    def data(self) -> Optional[bytes]:
+        """The data as bytes"""
+        data = self.raw_data
+        if data is None or isinstance(data, bytes):
+            return data
+        self._data = data = bytes(data)
+        self._view = None
+        return data
+
+    @data.setter
+    def data(self, value: Optional[Union[bytes, bytearray, memoryview]]) -> None:
+        self._data = value
+        self._view = None
+
+    @property
+    def raw_data(self) -> Optional[Union[bytes, bytearray, memoryview]]:
+        """The data as it is held, which is a view over the read buffer if
+        it has not yet been accessed. Forwarding a packet with this avoids
+        copying the data."""
+        return self._data if self._view is None else self._view
 
     def __str__(self) -> str:
         return f'entitlements={self.entitlements},data={self.data!r}'
 
-    def __repr__(self):
-        return f'DataPacket({self.entitlements}, {self.data})'
+    def __repr__(self) -> str:
+        return f'DataPacket({self.entitlements}, {self.data!r})'
 
-    def __eq__(self, value):
+    def __eq__(self, value: Any) -> bool:
         return (
             isinstance(value, DataPacket) and
             self.entitlements == value.entitlements and
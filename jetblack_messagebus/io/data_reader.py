@@ -1,18 +1,288 @@
 """Data Reader"""
 
-from asyncio import StreamReader
+from asyncio import StreamReader, IncompleteReadError
 import struct
-from typing import Optional, Set, List
+from typing import (
+    Any, Awaitable, Callable, Dict, Optional, Set, List, Tuple, TypeVar
+)
 from uuid import UUID
 
 from .data_packet import DataPacket
 
+# The minimum number of bytes requested from the stream when the buffer
+# needs refilling.
+READ_BUFFER_SIZE = 65536
+
+# Strings are cached by their encoded value, as feeds, topics, users and
+# hosts are drawn from a small set. The cache is cleared when it fills.
+MAX_CACHED_STRINGS = 4096
+MAX_CACHED_STRING_LENGTH = 256
+
+# Data packet payloads of at least this size are held as a view over the read
+# buffer until they are accessed. Smaller payloads are cheaper to copy than to
+# keep the whole buffer alive for.
+MIN_DEFERRED_COPY_SIZE = 1024
+
+_BOOLEAN = struct.Struct('?')
+_BYTE = struct.Struct('b')
+_INT = struct.Struct('>i')
+
+T = TypeVar('T')
+
+
+class IncompleteBufferError(Exception):
+    """Raised by the nowait methods of a DataReader when the buffer does not
+    yet hold the whole value."""
+
+    def __init__(self, end: int) -> None:
+        """Initialise the error.
+
+        Args:
+            end (int): The position in the buffer the value extends to.
+        """
+        super().__init__(end)
+        self.end = end
+
 
 class DataReader:
-    """A data reader class"""
+    """A data reader class.
+
+    The reader requests large blocks from the stream and decodes fields
+    from its own buffer, so most reads complete without waiting on the
+    stream.
+
+    Each value can also be read with a `read_<kind>_nowait` method, which
+    reads from the buffer alone and raises `IncompleteBufferError` if the
+    value has not all arrived. A parser built from these methods is run
+    with `read_parsed`, so a whole message which has arrived can be read
+    without a coroutine call per field.
+    """
 
     def __init__(self, reader: StreamReader) -> None:
         self.reader = reader
+        self._strings: Dict[bytes, str] = {}
+        self._buf = b''
+        self._pos = 0
+
+    async def _fill(self, count: int) -> None:
+        """Ensure at least count bytes are buffered.
+
+        Args:
+            count (int): The number of bytes required.
+
+        Raises:
+            IncompleteReadError: If the stream ends first.
+        """
+        parts = [self._buf[self._pos:]] if self._pos < len(self._buf) else []
+        available = len(self._buf) - self._pos
+        while available < count:
+            chunk = await self.reader.read(
+                max(count - available, READ_BUFFER_SIZE)
+            )
+            if not chunk:
+                raise IncompleteReadError(b''.join(parts), count)
+            parts.append(chunk)
+            available += len(chunk)
+        self._buf = b''.join(parts)
+        self._pos = 0
+
+    async def read_parsed(
+            self,
+            parse: Callable[..., T],
+            read: Callable[..., Awaitable[T]],
+            *args: Any
+    ) -> T:
+        """Run a parser over the buffer, or if the buffer is incomplete read
+        the value with an async reader instead.
+
+        The async reader waits for each part of the value as it is needed,
+        so a value which arrives over many reads from the stream is not
+        parsed again from the start for each of them.
+
+        Args:
+            parse (Callable[..., T]): A function which reads a value using
+                the nowait methods.
+            read (Callable[..., Awaitable[T]]): A coroutine function which
+                reads the same value using the async methods.
+            *args (Any): Arguments for the parser and reader.
+
+        Returns:
+            T: The value.
+        """
+        start = self._pos
+        try:
+            return parse(*args)
+        except IncompleteBufferError:
+            self._pos = start
+            return await read(*args)
+
+    async def _read_retrying(self, parse: Callable[..., T], *args: Any) -> T:
+        # Used for single values, which need at most a retry for each length
+        # prefix they hold.
+        while True:
+            start = self._pos
+            try:
+                return parse(*args)
+            except IncompleteBufferError as error:
+                self._pos = start
+                await self._fill(error.end - start)
+
+    def _read_exactly_nowait(self, count: int) -> bytes:
+        start = self._pos
+        end = start + count
+        if end > len(self._buf):
+            raise IncompleteBufferError(end)
+        self._pos = end
+        return self._buf[start:end]
+
+    def read_boolean_nowait(self) -> bool:
+        """Read a boolean from the buffer.
+
+        Returns:
+            bool: The boolean.
+        """
+        pos = self._pos
+        if pos + 1 > len(self._buf):
+            raise IncompleteBufferError(pos + 1)
+        value, = _BOOLEAN.unpack_from(self._buf, pos)
+        self._pos = pos + 1
+        return value
+
+    def read_byte_nowait(self) -> int:
+        """Read a byte from the buffer.
+
+        Returns:
+            int: The byte.
+        """
+        pos = self._pos
+        if pos + 1 > len(self._buf):
+            raise IncompleteBufferError(pos + 1)
+        value, = _BYTE.unpack_from(self._buf, pos)
+        self._pos = pos + 1
+        return value
+
+    def read_int_nowait(self) -> int:
+        """Read an int from the buffer.
+
+        Returns:
+            int: The int.
+        """
+        pos = self._pos
+        if pos + 4 > len(self._buf):
+            raise IncompleteBufferError(pos + 4)
+        value, = _INT.unpack_from(self._buf, pos)
+        self._pos = pos + 4
+        return value
+
+    def read_string_nowait(self, encoding: str = 'utf-8') -> str:
+        """Read a string from the buffer.
+
+        Args:
+            encoding (str, optional): The encoding. Defaults to 'utf-8'.
+
+        Returns:
+            str: The string.
+        """
+        # The length and the string are read inline, as this is the most
+        # frequent field.
+        buf, pos = self._buf, self._pos
+        if pos + 4 > len(buf):
+            raise IncompleteBufferError(pos + 4)
+        count, = _INT.unpack_from(buf, pos)
+        start = pos + 4
+        end = start + count
+        if end > len(buf):
+            raise IncompleteBufferError(end)
+        self._pos = end
+        encoded = buf[start:end]
+        if encoding != 'utf-8' or count > MAX_CACHED_STRING_LENGTH:
+            return encoded.decode(encoding)
+
+        value = self._strings.get(encoded)
+        if value is None:
+            if len(self._strings) >= MAX_CACHED_STRINGS:
+                self._strings.clear()
+            value = self._strings[encoded] = encoded.decode(encoding)
+        return value
+
+    def read_byte_array_nowait(self) -> Optional[bytes]:
+        """Read an array of bytes from the buffer.
+
+        Returns:
+            Optional[bytes]: The bytes or None.
+        """
+        count = self.read_int_nowait()
+        if count == 0:
+            return None
+        return self._read_exactly_nowait(count)
+
+    def read_uuid_nowait(self) -> UUID:
+        """Read a UUID from the buffer.
+
+        Returns:
+            UUID: The UUID.
+        """
+        return UUID(bytes_le=self._read_exactly_nowait(16))
+
+    def read_int_set_nowait(self) -> Optional[Set[int]]:
+        """Read a set of ints from the buffer.
+
+        Returns:
+            Optional[Set[int]]: The set of ints or None.
+        """
+        values = self._read_ints_nowait()
+        return None if values is None else set(values)
+
+    def _read_ints_nowait(self) -> Optional[Tuple[int, ...]]:
+        buf, pos = self._buf, self._pos
+        if pos + 4 > len(buf):
+            raise IncompleteBufferError(pos + 4)
+        count, = _INT.unpack_from(buf, pos)
+        pos += 4
+        if count == 0:
+            self._pos = pos
+            return None
+        end = pos + count * 4
+        if end > len(buf):
+            raise IncompleteBufferError(end)
+        self._pos = end
+        return struct.unpack_from(f'>{count}i', buf, pos)
+
+    def read_data_packet_nowait(self) -> DataPacket:
+        """Read a data packet from the buffer.
+
+        Returns:
+            DataPacket: The data packet.
+        """
+        values = self._read_ints_nowait()
+        entitlements = None if values is None else frozenset(values)
+        buf, pos = self._buf, self._pos
+        if pos + 4 > len(buf):
+            raise IncompleteBufferError(pos + 4)
+        count, = _INT.unpack_from(buf, pos)
+        start = pos + 4
+        end = start + count
+        if end > len(buf):
+            raise IncompleteBufferError(end)
+        self._pos = end
+        if count == 0:
+            return DataPacket(entitlements, None)
+        if count < MIN_DEFERRED_COPY_SIZE:
+            return DataPacket(entitlements, buf[start:end])
+        view = memoryview(buf)[start:end]
+        return DataPacket.from_view(entitlements, view)
+
+    def read_data_packet_array_nowait(self) -> Optional[List[DataPacket]]:
+        """Read an array of data packets from the buffer.
+
+        Returns:
+            Optional[List[DataPacket]]: The data packets or None.
+        """
+        count = self.read_int_nowait()
+        if count == 0:
+            return None
+        read_data_packet = self.read_data_packet_nowait
+        return [read_data_packet() for _ in range(count)]
 
     async def read_boolean(self) -> bool:
         """Read a boolean.
@@ -20,8 +290,7 @@ class DataReader:
         Returns:
             bool: The boolean.
         """
-        buf = await self.reader.readexactly(1)
-        return struct.unpack('?', buf)[0]
+        return await self._read_retrying(self.read_boolean_nowait)
 
     async def read_byte(self) -> int:
         """Read a byte.
@@ -29,8 +298,7 @@ class DataReader:
         Returns:
             int: The byte.
         """
-        buf = await self.reader.readexactly(1)
-        return struct.unpack('b', buf)[0]
+        return await self._read_retrying(self.read_byte_nowait)
 
     async def read_int(self) -> int:
         """Read an int.
@@ -38,8 +306,7 @@ class DataReader:
         Returns:
             int: The int.
         """
-        buf = await self.reader.readexactly(4)
-        return struct.unpack('>i', buf)[0]
+        return await self._read_retrying(self.read_int_nowait)
 
     async def read_string(self, encoding: str = 'utf-8') -> str:
         """Read a string.
@@ -50,9 +317,7 @@ class DataReader:
         Returns:
             str: The string.
         """
-        count = await self.read_int()
-        buf = await self.reader.readexactly(count)
-        return buf.decode(encoding)
+        return await self._read_retrying(self.read_string_nowait, encoding)
 
     async def read_byte_array(self) -> Optional[bytes]:
         """Read an array of bytes.
@@ -60,11 +325,7 @@ class DataReader:
         Returns:
             Optional[bytes]: The bytes or None.
         """
-        count = await self.read_int()
-        if count == 0:
-            return None
-        buf = await self.reader.readexactly(count)
-        return buf
+        return await self._read_retrying(self.read_byte_array_nowait)
 
     async def read_uuid(self) -> UUID:
         """Read a UUID.
@@ -72,8 +333,7 @@ class DataReader:
         Returns:
             UUID: The UUID.
         """
-        buf = await self.reader.readexactly(16)
-        return UUID(bytes_le=buf)
+        return await self._read_retrying(self.read_uuid_nowait)
 
     async def read_int_set(self) -> Optional[Set[int]]:
         """Read a set of ints
@@ -81,14 +341,7 @@ class DataReader:
         Returns:
             Optional[Set[int]]: The set of ints or None.
         """
-        count = await self.read_int()
-        if count == 0:
-            return None
-        data = set()
-        for _ in range(count):
-            value = await self.read_int()
-            data.add(value)
-        return data
+        return await self._read_retrying(self.read_int_set_nowait)
 
     async def read_data_packet(self) -> DataPacket:
         """Read a data packet
@@ -96,9 +349,7 @@ class DataReader:
         Returns:
             DataPacket: The data packet.
         """
-        entitlements = await self.read_int_set()
-        data = await self.read_byte_array()
-        return DataPacket(entitlements, data)
+        return await self._read_retrying(self.read_data_packet_nowait)
 
     async def read_data_packet_array(self) -> Optional[List[DataPacket]]:
         """Read an array of data packets.
@@ -106,6 +357,12 @@ class DataReader:
         Returns:
             Optional[List[DataPacket]]: The data packets or None.
         """
+        return await self.read_parsed(
+            self.read_data_packet_array_nowait,
+            self._read_data_packet_array
+        )
+
+    async def _read_data_packet_array(self) -> Optional[List[DataPacket]]:
         count = await self.read_int()
         if count == 0:
             return None
@@ -1,18 +1,67 @@
 """Data Writer"""
 
 from asyncio import StreamWriter
+from functools import lru_cache
 import struct
-from typing import Optional, Set, List
+from typing import AbstractSet, Optional, List, Union
 from uuid import UUID
 
 from .data_packet import DataPacket
 
+# Immutable byte arrays of at least this size are passed to the stream as
+# they are, rather than being copied into the buffer. Mutable byte arrays
+# are always copied, as the stream may hold them until the transport sends
+# them, and the caller may reuse the buffer in the meantime.
+MIN_GATHER_SIZE = 4096
+
+# Strings are cached with their length prefix once encoded, as the feeds and
+# topics that are sent are drawn from a small set.
+MAX_CACHED_STRINGS = 4096
+MAX_CACHED_STRING_LENGTH = 256
+
+_BOOLEAN = struct.Struct('?')
+_BYTE = struct.Struct('b')
+_INT = struct.Struct('>i')
+
+
+@lru_cache(maxsize=MAX_CACHED_STRINGS)
+def _encode_string(val: str, encoding: str) -> bytes:
+    buf = val.encode(encoding)
+    return _INT.pack(len(buf)) + buf
+
+
+def _is_immutable(val: Union[bytes, bytearray, memoryview]) -> bool:
+    # A read-only view may still be over a mutable object, so a view is
+    # only immutable when it is over bytes, as the views of the read buffer
+    # held by a data packet are.
+    if isinstance(val, memoryview):
+        return isinstance(val.obj, bytes)
+    return isinstance(val, bytes)
+
 
 class DataWriter:
-    """Data Writer"""
+    """Data Writer
+
+    Values are collected in a buffer and passed to the stream in a single
+    write when the writer is flushed or drained. Large byte arrays are kept
+    as separate chunks and the whole is passed to the stream with
+    writelines, so the payloads are not copied.
+    """
 
     def __init__(self, writer: StreamWriter) -> None:
         self.writer = writer
+        self._buf = bytearray()
+        self._chunks: List[Union[bytes, bytearray, memoryview]] = []
+        self._chunks_size = 0
+
+    @property
+    def buffered(self) -> int:
+        """The number of bytes written but not yet passed to the stream.
+
+        Returns:
+            int: The number of bytes.
+        """
+        return self._chunks_size + len(self._buf)
 
     def write_boolean(self, val: bool) -> None:
         """Write a boolean
@@ -20,8 +69,7 @@ class DataWriter:
         Args:
             val (bool): Th boolean value.
         """
-        buf = struct.pack('?', val)
-        self.writer.write(buf)
+        self._buf += _BOOLEAN.pack(val)
 
     def write_byte(self, val: int) -> None:
         """Write a byte
@@ -29,16 +77,23 @@ class DataWriter:
         Args:
             val (int): The value to write.
         """
-        buf = struct.pack('b', val)
-        self.writer.write(buf)
+        self._buf += _BYTE.pack(val)
 
-    def write_int(self, val) -> None:
+    def write_raw(self, val: bytes) -> None:
+        """Write bytes as they are, without a length prefix.
+
+        Args:
+            val (bytes): The bytes to write.
+        """
+        self._buf += val
+
+    def write_int(self, val: int) -> None:
         """Write an int
 
         Args:
             val ([type]): The int value.
         """
-        self.writer.write(struct.pack('>i', val))
+        self._buf += _INT.pack(val)
 
     def write_string(self, val: Optional[str], encoding: str = 'utf-8') -> None:
         """Writ a string.
@@ -49,22 +104,39 @@ class DataWriter:
         """
         if val is None:
             self.write_int(0)
+        elif len(val) <= MAX_CACHED_STRING_LENGTH:
+            self._buf += _encode_string(val, encoding)
         else:
-            self.write_int(len(val))
             buf = val.encode(encoding)
-            self.writer.write(buf)
+            self.write_int(len(buf))
+            self._buf += buf
 
-    def write_byte_array(self, val: Optional[bytes]) -> None:
+    def write_byte_array(
+            self,
+            val: Optional[Union[bytes, bytearray, memoryview]]
+    ) -> None:
         """Write an array of bytes.
 
         Args:
-            val (Optional[bytes]): The bytes to write.
+            val (Optional[Union[bytes, bytearray, memoryview]]): The bytes to
+                write.
         """
         if val is None:
             self.write_int(0)
+            return
+
+        if isinstance(val, memoryview) and val.format != 'B':
+            # The length of a memoryview counts items rather than bytes.
+            val = val.cast('B')
+        count = len(val)
+        self._buf += _INT.pack(count)
+        if count < MIN_GATHER_SIZE or not _is_immutable(val):
+            self._buf += val
         else:
-            self.write_int(len(val))
-            self.writer.write(val)
+            self._chunks.append(self._buf)
+            self._chunks.append(val)
+            self._chunks_size += len(self._buf) + count
+            self._buf = bytearray()
 
     def write_uuid(self, val: UUID) -> None:
         """Write a UUID
@@ -72,20 +144,19 @@ class DataWriter:
         Args:
             val (UUID): The id to write.
         """
-        self.writer.write(val.bytes_le)
+        self._buf += val.bytes_le
 
-    def write_int_set(self, val: Optional[Set[int]]) -> None:
+    def write_int_set(self, val: Optional[AbstractSet[int]]) -> None:
         """Writ a set of ints
 
         Args:
-            val (Optional[Set[int]]): The set or None.
+            val (Optional[AbstractSet[int]]): The set or None.
         """
         if val is None:
             self.write_int(0)
         else:
-            self.write_int(len(val))
-            for item in val:
-                self.write_int(item)
+            count = len(val)
+            self._buf += struct.pack(f'>i{count}i', count, *val)
 
     def write_data_packet(self, val: DataPacket) -> None:
         """Write a data packet.
@@ -94,7 +165,7 @@ class DataWriter:
             val (DataPacket): The data packets.
         """
         self.write_int_set(val.entitlements)
-        self.write_byte_array(val.data)
+        self.write_byte_array(val.raw_data)
 
     def write_data_packet_array(self, val: Optional[List[DataPacket]]) -> None:
         """Write an array of data packets.
@@ -109,14 +180,32 @@ class DataWriter:
             for packet in val:
                 self.write_data_packet(packet)
 
+    def flush(self) -> None:
+        """Pass the buffered bytes to the stream.
+        """
+        # The stream may keep a reference to the buffer, so it is handed over
+        # rather than reused.
+        if self._chunks:
+            chunks, self._chunks = self._chunks, []
+            if self._buf:
+                chunks.append(self._buf)
+                self._buf = bytearray()
+            self._chunks_size = 0
+            self.writer.writelines(chunks)
+        elif self._buf:
+            buf, self._buf = self._buf, bytearray()
+            self.writer.write(buf)
+
     async def drain(self) -> None:
-        """Drain the writer.
+        """Flush the buffer and drain the writer.
         """
+        self.flush()
         await self.writer.drain()
 
     async def close(self) -> None:
         """Close the connection
         """
+        self.flush()
         if self.writer.can_write_eof():
             self.writer.write_eof()
             await self.writer.drain()
@@ -1,14 +1,17 @@
 """Messages"""
 
 from __future__ import annotations
-from abc import ABCMeta, abstractmethod
-from enum import Enum
-from typing import Optional, Set, List, Any
+from collections import Counter
+from enum import IntEnum
+from typing import (
+    Optional, Set, List, Any, Awaitable, Callable, ClassVar, Dict, Iterable,
+    Tuple, Type
+)
 from uuid import UUID
 from .io import DataReader, DataWriter, DataPacket
 
 
-class MessageType(Enum):
+class MessageType(IntEnum):
     """Message types"""
     MULTICAST_DATA = 1
     UNICAST_DATA = 2
@@ -21,16 +24,56 @@ class MessageType(Enum):
     FORWARDED_UNICAST_DATA = 9
 
 
-class Message(metaclass=ABCMeta):
-    """Message Base Class"""
-
-    def __init__(self, message_type: MessageType) -> None:
-        self.message_type = message_type
+class Message:
+    """Message Base Class
+
+    A subclass sets its `message_type`, from which the header is computed
+    once, and declares its wire layout in `_SCHEMA` as a tuple of
+    (attribute, kind) pairs in wire order, where the kind names the
+    `DataReader.read_<kind>_nowait` and `DataWriter.write_<kind>` methods.
+    The body parser and writer are generated from the schema when the class
+    is created, as are `__eq__` and `__repr__`, which also serves as the
+    string form. The constructor must take the attributes in the same order,
+    and the subclass must list them in its `__slots__`.
+    """
+
+    __slots__ = ()
+
+    message_type: ClassVar[MessageType]
+    _HEADER: ClassVar[bytes]
+    _SCHEMA: ClassVar[Tuple[Tuple[str, str], ...]]
+    # Generated from the schema.
+    parse_body: ClassVar[Callable[[DataReader], Message]]
+    read_body: ClassVar[Callable[[DataReader], Awaitable[Message]]]
+    write_body: Callable[[DataWriter], None]
+    # The body parser and reader for each message type, registered as the
+    # subclasses are created, so reading a message needs a single lookup.
+    _BODY_PARSERS: ClassVar[
+        Dict[int, Callable[[DataReader], Message]]
+    ] = {}
+    _BODY_READERS: ClassVar[
+        Dict[int, Callable[[DataReader], Awaitable[Message]]]
+    ] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if '_SCHEMA' in cls.__dict__:
+            _compile_schema(cls)
+        if 'message_type' in cls.__dict__:
+            if not hasattr(cls, '_SCHEMA'):
+                raise TypeError(
+                    f'Message type {cls.__name__} has no schema')
+            cls._HEADER = bytes([cls.message_type])
+            Message._BODY_PARSERS[cls.message_type] = cls.parse_body
+            Message._BODY_READERS[cls.message_type] = cls.read_body
 
     @classmethod
     async def read(cls, reader: DataReader) -> Message:
         """Read a messags
 
+        A message which has already arrived is parsed in one call. Otherwise
+        it is read field by field as the data arrives.
+
         Args:
             reader (DataReader): The data reader.
 
@@ -40,34 +83,38 @@ class Message(metaclass=ABCMeta):
         Returns:
             Message: The message.
         """
-        message_type = await cls._read_header(reader)
-
-        if message_type == MessageType.MULTICAST_DATA:
-            return await MulticastData.read_body(reader)
-        elif message_type == MessageType.UNICAST_DATA:
-            return await UnicastData.read_body(reader)
-        elif message_type == MessageType.FORWARDED_SUBSCRIPTION_REQUEST:
-            return await ForwardedSubscriptionRequest.read_body(reader)
-        elif message_type == MessageType.NOTIFICATION_REQUEST:
-            return await NotificationRequest.read_body(reader)
-        elif message_type == MessageType.SUBSCRIPTION_REQUEST:
-            return await SubscriptionRequest.read_body(reader)
-        elif message_type == MessageType.AUTHORIZATION_REQUEST:
-            return await AuthorizationRequest.read_body(reader)
-        elif message_type == MessageType.AUTHORIZATION_RESPONSE:
-            return await AuthorizationResponse.read_body(reader)
-        elif message_type == MessageType.FORWARDED_MULTICAST_DATA:
-            return await ForwardedMulticastData.read_body(reader)
-        elif message_type == MessageType.FORWARDED_UNICAST_DATA:
-            return await ForwardedUnicastData.read_body(reader)
-        else:
-            raise RuntimeError(f'Invalid message type {message_type}')
+        return await reader.read_parsed(cls.parse, cls._read, reader)
 
     @classmethod
-    async def _read_header(cls, reader: DataReader) -> MessageType:
-        """Read the message header"""
+    async def _read(cls, reader: DataReader) -> Message:
         message_type = await reader.read_byte()
-        return MessageType(int(message_type))
+        read_body = cls._BODY_READERS.get(message_type)
+        if read_body is None:
+            raise RuntimeError(f'Invalid message type {message_type}')
+        return await read_body(reader)
+
+    @classmethod
+    def parse(cls, reader: DataReader) -> Message:
+        """Read a message from the buffer of the reader.
+
+        Args:
+            reader (DataReader): The data reader.
+
+        Raises:
+            RuntimeError: When the message type is unknown.
+            IncompleteBufferError: When the buffer does not yet hold the
+                whole message.
+
+        Returns:
+            Message: The message.
+        """
+        # The header byte is looked up as it is, as a message type compares
+        # and hashes as its int value.
+        message_type = reader.read_byte_nowait()
+        parse_body = cls._BODY_PARSERS.get(message_type)
+        if parse_body is None:
+            raise RuntimeError(f'Invalid message type {message_type}')
+        return parse_body(reader)
 
     def write_header(self, writer: DataWriter) -> None:
         """Write the message header
@@ -75,15 +122,17 @@ class Message(metaclass=ABCMeta):
         Args:
             writer (DataWriter): The data writer
         """
-        writer.write_byte(self.message_type.value)
+        writer.write_raw(self._HEADER)
 
-    @abstractmethod
-    def write_body(self, writer: DataWriter) -> None:
-        """Write the message body
+    def serialize(self, writer: DataWriter) -> None:
+        """Write the message to the buffer of the writer. The message is sent
+        when the writer is drained.
 
         Args:
             writer (DataWriter): The data writer
         """
+        self.write_header(writer)
+        self.write_body(writer)
 
     async def write(self, writer: DataWriter) -> None:
         """Write the message.
@@ -91,26 +140,171 @@ class Message(metaclass=ABCMeta):
         Args:
             writer (DataWriter): The data writer
         """
-        self.write_header(writer)
-        self.write_body(writer)
+        self.serialize(writer)
         await writer.drain()
 
-    @classmethod
-    @abstractmethod
-    async def read_body(cls, reader: DataReader) -> Message:
-        """Read message the body
+    @staticmethod
+    async def write_many(writer: DataWriter, messages: Iterable[Message]) -> None:
+        """Write messages as one batch, which is sent with a single drain.
+
+        Args:
+            writer (DataWriter): The data writer
+            messages (Iterable[Message]): The messages.
+        """
+        for message in messages:
+            message.serialize(writer)
+        await writer.drain()
+
+
+# The docstrings of the methods generated from a schema.
+_GENERATED_DOCS = {
+    'parse_body': """Read the message body from the buffer of the reader.
 
         Args:
             reader (DataReader): The data reader
 
+        Raises:
+            IncompleteBufferError: When the buffer does not yet hold the
+                whole body.
+
         Returns:
             Message: The message.
-        """
+        """,
+    'read_body': """Read message the body
+
+        Args:
+            reader (DataReader): The data reader
+
+        Returns:
+            Message: The message.
+        """,
+    'write_body': """Write the message body
+
+        Args:
+            writer (DataWriter): The data writer
+        """,
+    '__eq__': object.__eq__.__doc__,
+    '__repr__': object.__repr__.__doc__
+}
+
+
+def _compile_schema(cls: Type[Message]) -> None:
+    """Generate the parse_body, read_body, write_body, __eq__ and __repr__
+    methods of a message class from its schema.
+
+    The generated functions read or write each field in turn with no
+    per-field lookups beyond the reader or writer method. Methods used for
+    more than one field are bound once. The body is parsed with the nowait
+    methods of the reader, so reading a message which has arrived is a
+    plain function call per field rather than an await. The body reader
+    awaits each field, and is used when the message is still arriving.
+
+    Args:
+        cls (Type[Message]): The message class.
+    """
+    kinds = Counter(kind for _, kind in cls._SCHEMA)
+    hoisted = sorted(kind for kind, count in kinds.items() if count > 1)
+
+    def method(stream: str, name: str, kind: str) -> str:
+        return name if kind in hoisted else f'{stream}.{name}'
+
+    arguments = ", ".join(name for name, _ in cls._SCHEMA)
+    parse_source = '\n'.join([
+        'def parse_body(cls, reader):',
+        *(
+            f'    read_{kind}_nowait = reader.read_{kind}_nowait'
+            for kind in hoisted
+        ),
+        *(
+            f'    {name} = {method("reader", f"read_{kind}_nowait", kind)}()'
+            for name, kind in cls._SCHEMA
+        ),
+        f'    return cls({arguments})'
+    ])
+    read_source = '\n'.join([
+        'async def read_body(cls, reader):',
+        *(f'    read_{kind} = reader.read_{kind}' for kind in hoisted),
+        *(
+            f'    {name} = await {method("reader", f"read_{kind}", kind)}()'
+            for name, kind in cls._SCHEMA
+        ),
+        f'    return cls({arguments})'
+    ])
+    write_source = '\n'.join([
+        'def write_body(self, writer):',
+        *(f'    write_{kind} = writer.write_{kind}' for kind in hoisted),
+        *(
+            f'    {method("writer", f"write_{kind}", kind)}(self.{name})'
+            for name, kind in cls._SCHEMA
+        )
+    ])
+    eq_source = '\n'.join([
+        'def __eq__(self, value):',
+        '    return (',
+        '        isinstance(value, message_class)',
+        *(f'        and self.{name} == value.{name}' for name, _ in cls._SCHEMA),
+        '    )'
+    ])
+    repr_source = '\n'.join([
+        'def __repr__(self):',
+        "    return f'{}({})'".format(
+            cls.__name__,
+            ', '.join(f'{name}={{self.{name}!r}}' for name, _ in cls._SCHEMA)
+        )
+    ])
+
+    namespace: Dict[str, Any] = {'message_class': cls}
+    exec(  # pylint: disable=exec-used
+        compile(
+            '\n\n'.join([
+                parse_source,
+                read_source,
+                write_source,
+                eq_source,
+                repr_source
+            ]),
+            f'<{cls.__name__} schema>',
+            'exec'
+        ),
+        namespace
+    )
+    for name in ('parse_body', 'read_body', 'write_body', '__eq__', '__repr__'):
+        function = namespace[name]
+        function.__module__ = cls.__module__
+        function.__qualname__ = f'{cls.__qualname__}.{name}'
+        function.__doc__ = _GENERATED_DOCS[name]
+    setattr(cls, 'parse_body', classmethod(namespace['parse_body']))
+    setattr(cls, 'read_body', classmethod(namespace['read_body']))
+    setattr(cls, 'write_body', namespace['write_body'])
+    setattr(cls, '__eq__', namespace['__eq__'])
+    setattr(cls, '__repr__', namespace['__repr__'])
+    # As for a hand written __eq__, the messages are mutable so unhashable.
+    setattr(cls, '__hash__', None)
+
+
+# The fields which end every data message.
+_DATA_SCHEMA = (
+    ('feed', 'string'),
+    ('topic', 'string'),
+    ('content_type', 'string'),
+    ('data_packets', 'data_packet_array'),
+)
 
 
 class MulticastData(Message):
     """A multicast data message"""
 
+    message_type = MessageType.MULTICAST_DATA
+
+    _SCHEMA = _DATA_SCHEMA
+
+    __slots__ = (
+        'feed',
+        'topic',
+        'content_type',
+        'data_packets',
+    )
+
     def __init__(
             self,
             feed: str,
@@ -126,47 +320,29 @@ class MulticastData(Message):
             content_type (str): The content type.
             data_packets (Optional[List[DataPacket]]): The data packets.
         """
-        super().__init__(MessageType.MULTICAST_DATA)
         self.feed = feed
         self.topic = topic
         self.content_type = content_type
         self.data_packets = data_packets
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> MulticastData:
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        content_type = await reader.read_string()
-        data_packets = await reader.read_data_packet_array()
-        return MulticastData(feed, topic, content_type, data_packets)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_string(self.content_type)
-        writer.write_data_packet_array(self.data_packets)
-
-    def __str__(self) -> str:
-        return 'MulticastData(feed="{}",topic="{}",content_type={},data_packets={})'.format(
-            self.feed,
-            self.topic,
-            self.content_type,
-            self.data_packets
-        )
-
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, MulticastData) and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.content_type == value.content_type and
-            self.data_packets == value.data_packets
-        )
-
 
 class UnicastData(Message):
     """A unicast data message"""
 
+    message_type = MessageType.UNICAST_DATA
+
+    _SCHEMA = (
+        ('client_id', 'uuid'),
+    ) + _DATA_SCHEMA
+
+    __slots__ = (
+        'client_id',
+        'feed',
+        'topic',
+        'content_type',
+        'data_packets',
+    )
+
     def __init__(
             self,
             client_id: UUID,
@@ -184,52 +360,36 @@ class UnicastData(Message):
             content_type (str): The content type.
             data_packets (Optional[List[DataPacket]]): The data packets.
         """
-        super().__init__(MessageType.UNICAST_DATA)
         self.client_id = client_id
         self.feed = feed
         self.topic = topic
         self.content_type = content_type
         self.data_packets = data_packets
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> UnicastData:
-        client_id = await reader.read_uuid()
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        content_type = await reader.read_string()
-        data_packets = await reader.read_data_packet_array()
-        return UnicastData(client_id, feed, topic, content_type, data_packets)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_uuid(self.client_id)
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_string(self.content_type)
-        writer.write_data_packet_array(self.data_packets)
-
-    def __str__(self) -> str:
-        return 'UnicastData(client_id={},feed="{}",topic="{}",content_type={},data_packets={})'.format(
-            self.client_id,
-            self.feed,
-            self.topic,
-            self.content_type,
-            self.data_packets
-        )
-
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, UnicastData) and
-            self.client_id == value.client_id and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.content_type == value.content_type and
-            self.data_packets == value.data_packets
-        )
-
 
 class ForwardedSubscriptionRequest(Message):
     """A forwarded subscription request"""
 
+    message_type = MessageType.FORWARDED_SUBSCRIPTION_REQUEST
+
+    _SCHEMA = (
+        ('user', 'string'),
+        ('host', 'string'),
+        ('client_id', 'uuid'),
+        ('feed', 'string'),
+        ('topic', 'string'),
+        ('is_add', 'boolean'),
+    )
+
+    __slots__ = (
+        'user',
+        'host',
+        'client_id',
+        'feed',
+        'topic',
+        'is_add',
+    )
+
     def __init__(
             self,
             user: str,
@@ -249,7 +409,6 @@ class ForwardedSubscriptionRequest(Message):
             topic (str): The topic name.
             is_add (bool): If true the request was to add a subscription.
         """
-        super().__init__(MessageType.FORWARDED_SUBSCRIPTION_REQUEST)
         self.user = user
         self.host = host
         self.client_id = client_id
@@ -257,50 +416,22 @@ class ForwardedSubscriptionRequest(Message):
         self.topic = topic
         self.is_add = is_add
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> ForwardedSubscriptionRequest:
-        user = await reader.read_string()
-        host = await reader.read_string()
-        client_id = await reader.read_uuid()
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        is_add = await reader.read_boolean()
-        return ForwardedSubscriptionRequest(user, host, client_id, feed, topic, is_add)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_string(self.user)
-        writer.write_string(self.host)
-        writer.write_uuid(self.client_id)
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_boolean(self.is_add)
-
-    def __str__(self) -> str:
-        # pylint: disable=line-too-long
-        return 'ForwardedSubscriptionRequest(user="{}",host="{}",client_id={},feed="{}",topic="{}",is_add={})'.format(
-            self.user,
-            self.host,
-            self.client_id,
-            self.feed,
-            self.topic,
-            self.is_add
-        )
-
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, ForwardedSubscriptionRequest) and
-            self.user == value.user and
-            self.host == value.host and
-            self.client_id == value.client_id and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.is_add == value.is_add
-        )
-
 
 class NotificationRequest(Message):
     """A notification request message"""
 
+    message_type = MessageType.NOTIFICATION_REQUEST
+
+    _SCHEMA = (
+        ('feed', 'string'),
+        ('is_add', 'boolean'),
+    )
+
+    __slots__ = (
+        'feed',
+        'is_add',
+    )
+
     def __init__(self, feed: str, is_add: bool) -> None:
         """A request for notification of subscriptions on a feed.
 
@@ -308,37 +439,27 @@ class NotificationRequest(Message):
             feed (str): The feed name.
             is_add (bool): True to add a subscription, false to remove.
         """
-        super().__init__(MessageType.NOTIFICATION_REQUEST)
         self.feed = feed
         self.is_add = is_add
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> NotificationRequest:
-        feed = await reader.read_string()
-        is_add = await reader.read_boolean()
-        return NotificationRequest(feed, is_add)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_string(self.feed)
-        writer.write_boolean(self.is_add)
-
-    def __str__(self) -> str:
-        return 'NotificationRequest(feed="{}",is_add={})'.format(
-            self.feed,
-            self.is_add
-        )
-
-    def __eq__(self, value):
-        return (
-            isinstance(value, NotificationRequest) and
-            self.feed == value.feed and
-            self.is_add == value.is_add
-        )
-
 
 class SubscriptionRequest(Message):
     """A subscription request message"""
 
+    message_type = MessageType.SUBSCRIPTION_REQUEST
+
+    _SCHEMA = (
+        ('feed', 'string'),
+        ('topic', 'string'),
+        ('is_add', 'boolean'),
+    )
+
+    __slots__ = (
+        'feed',
+        'topic',
+        'is_add',
+    )
+
     def __init__(self, feed: str, topic: str, is_add: bool) -> None:
         """Request a subscription.
 
@@ -347,42 +468,32 @@ class SubscriptionRequest(Message):
             topic (str): The topic name.
             is_add (bool): True to add a subscription, False to remove.
         """
-        super().__init__(MessageType.SUBSCRIPTION_REQUEST)
         self.feed = feed
         self.topic = topic
         self.is_add = is_add
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> Message:
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        is_add = await reader.read_boolean()
-        return SubscriptionRequest(feed, topic, is_add)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_boolean(self.is_add)
-
-    def __str__(self) -> str:
-        return 'SubscriptionRequest(feed="{}",topic="{}",is_add={})'.format(
-            self.feed,
-            self.topic,
-            self.is_add
-        )
-
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, SubscriptionRequest) and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.is_add == value.is_add
-        )
-
 
 class AuthorizationRequest(Message):
     """An authorization request message"""
 
+    message_type = MessageType.AUTHORIZATION_REQUEST
+
+    _SCHEMA = (
+        ('client_id', 'uuid'),
+        ('host', 'string'),
+        ('user', 'string'),
+        ('feed', 'string'),
+        ('topic', 'string'),
+    )
+
+    __slots__ = (
+        'client_id',
+        'host',
+        'user',
+        'feed',
+        'topic',
+    )
+
     def __init__(
             self,
             client_id: UUID,
@@ -400,52 +511,34 @@ class AuthorizationRequest(Message):
             feed (str): The feed name.
             topic (str): The topic name.
         """
-        super().__init__(MessageType.AUTHORIZATION_REQUEST)
         self.client_id = client_id
         self.host = host
         self.user = user
         self.feed = feed
         self.topic = topic
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> Message:
-        client_id = await reader.read_uuid()
-        host = await reader.read_string()
-        user = await reader.read_string()
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        return AuthorizationRequest(client_id, host, user, feed, topic)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_uuid(self.client_id)
-        writer.write_string(self.host)
-        writer.write_string(self.user)
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-
-    def __str__(self):
-        return 'AuthorizationRequest(client_id={},host="{}",user="{}",feed="{}",topic="{}"'.format(
-            self.client_id,
-            self.host,
-            self.user,
-            self.feed,
-            self.topic
-        )
-
-    def __eq__(self, value):
-        return (
-            isinstance(value, AuthorizationRequest) and
-            self.client_id == value.client_id and
-            self.host == value.host and
-            self.user == value.user and
-            self.feed == value.feed and
-            self.topic == value.topic
-        )
-
 
 class AuthorizationResponse(Message):
     """An authorization response"""
 
+    message_type = MessageType.AUTHORIZATION_RESPONSE
+
+    _SCHEMA = (
+        ('client_id', 'uuid'),
+        ('feed', 'string'),
+        ('topic', 'string'),
+        ('is_authorization_required', 'boolean'),
+        ('entitlements', 'int_set'),
+    )
+
+    __slots__ = (
+        'client_id',
+        'feed',
+        'topic',
+        'is_authorization_required',
+        'entitlements',
+    )
+
     def __init__(
             self,
             client_id: UUID,
@@ -463,58 +556,31 @@ class AuthorizationResponse(Message):
             is_authorization_required (bool): If true authentication is required.
             entitlements (Optional[Set[int]]): The set of entitlements for the user.
         """
-        super().__init__(MessageType.AUTHORIZATION_RESPONSE)
         self.client_id = client_id
         self.feed = feed
         self.topic = topic
         self.is_authorization_required = is_authorization_required
         self.entitlements = entitlements
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> Message:
-        client_id = await reader.read_uuid()
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        is_authorization_required = await reader.read_boolean()
-        entitlements = await reader.read_int_set()
-        return AuthorizationResponse(
-            client_id,
-            feed,
-            topic,
-            is_authorization_required,
-            entitlements
-        )
 
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_uuid(self.client_id)
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_boolean(self.is_authorization_required)
-        writer.write_int_set(self.entitlements)
-
-    def __str__(self):
-        # pylint: disable=line-too-long
-        return 'AuthorizationResponse(client_id={},feed="{}",topic="{}",is_authorization_required={},entitlements={}'.format(
-            self.client_id,
-            self.feed,
-            self.topic,
-            self.is_authorization_required,
-            self.entitlements
-        )
+class ForwardedMulticastData(Message):
+    """A forwarded multicast data message"""
 
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, AuthorizationResponse) and
-            self.client_id == value.client_id and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.is_authorization_required == value.is_authorization_required and
-            self.entitlements == value.entitlements
-        )
+    message_type = MessageType.FORWARDED_MULTICAST_DATA
 
+    _SCHEMA = (
+        ('user', 'string'),
+        ('host', 'string'),
+    ) + _DATA_SCHEMA
 
-class ForwardedMulticastData(Message):
-    """A forwarded multicast data message"""
+    __slots__ = (
+        'user',
+        'host',
+        'feed',
+        'topic',
+        'content_type',
+        'data_packets',
+    )
 
     def __init__(
             self,
@@ -535,7 +601,6 @@ class ForwardedMulticastData(Message):
             content_type (str): The type of the message contents.
             data_packets (Optional[List[DataPacket]]): The data packets.
         """
-        super().__init__(MessageType.FORWARDED_MULTICAST_DATA)
         self.user = user
         self.host = host
         self.feed = feed
@@ -543,50 +608,28 @@ class ForwardedMulticastData(Message):
         self.content_type = content_type
         self.data_packets = data_packets
 
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> Message:
-        user = await reader.read_string()
-        host = await reader.read_string()
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        content_type = await reader.read_string()
-        data_packets = await reader.read_data_packet_array()
-        return ForwardedMulticastData(user, host, feed, topic, content_type, data_packets)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_string(self.user)
-        writer.write_string(self.host)
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_string(self.content_type)
-        writer.write_data_packet_array(self.data_packets)
-
-    def __str__(self):
-        # pylint: disable=line-too-long
-        return 'ForwardedMulticastData(user="{}",host="{}",feed="{}",topic="{}",content_type={},data_packets={}'.format(
-            self.user,
-            self.host,
-            self.feed,
-            self.topic,
-            self.content_type,
-            self.data_packets
-        )
-
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, ForwardedMulticastData) and
-            self.user == value.user and
-            self.host == value.host and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.content_type == value.content_type and
-            self.data_packets == value.data_packets
-        )
-
 
 class ForwardedUnicastData(Message):
     """A forwarded unicast message"""
 
+    message_type = MessageType.FORWARDED_UNICAST_DATA
+
+    _SCHEMA = (
+        ('user', 'string'),
+        ('host', 'string'),
+        ('client_id', 'uuid'),
+    ) + _DATA_SCHEMA
+
+    __slots__ = (
+        'user',
+        'host',
+        'client_id',
+        'feed',
+        'topic',
+        'content_type',
+        'data_packets',
+    )
+
     def __init__(
             self,
             user: str,
@@ -608,7 +651,6 @@ class ForwardedUnicastData(Message):
             content_type (str): The type of the message contents.
             data_packets (Optional[List[DataPacket]]): The data packets.
         """
-        super().__init__(MessageType.FORWARDED_UNICAST_DATA)
         self.user = user
         self.host = host
         self.client_id = client_id
@@ -616,47 +658,3 @@ class ForwardedUnicastData(Message):
         self.topic = topic
         self.content_type = content_type
         self.data_packets = data_packets
-
-    @classmethod
-    async def read_body(cls, reader: DataReader) -> Message:
-        user = await reader.read_string()
-        host = await reader.read_string()
-        client_id = await reader.read_uuid()
-        feed = await reader.read_string()
-        topic = await reader.read_string()
-        content_type = await reader.read_string()
-        data_packets = await reader.read_data_packet_array()
-        return ForwardedUnicastData(user, host, client_id, feed, topic, content_type, data_packets)
-
-    def write_body(self, writer: DataWriter) -> None:
-        writer.write_string(self.user)
-        writer.write_string(self.host)
-        writer.write_uuid(self.client_id)
-        writer.write_string(self.feed)
-        writer.write_string(self.topic)
-        writer.write_string(self.content_type)
-        writer.write_data_packet_array(self.data_packets)
-
-    def __str__(self):
-        # pylint: disable=line-too-long
-        return 'ForwardedUnicastData(user="{}",host="{}",client_id={},feed="{}",topic="{}",content_type={},data_packets={}'.format(
-            self.user,
-            self.host,
-            self.client_id,
-            self.feed,
-            self.topic,
-            self.content_type,
-            self.data_packets
-        )
-
-    def __eq__(self, value: Any) -> bool:
-        return (
-            isinstance(value, ForwardedUnicastData) and
-            self.user == value.user and
-            self.host == value.host and
-            self.client_id == value.client_id and
-            self.feed == value.feed and
-            self.topic == value.topic and
-            self.content_type == value.content_type and
-            self.data_packets == value.data_packets
-        )
@@ -8,7 +8,7 @@ from asyncio import (
     FIRST_COMPLETED,
     CancelledError
 )
-from typing import AsyncIterator, Set, Callable, Awaitable, TypeVar
+from typing import AsyncIterator, Set, Callable, Awaitable, Iterable, TypeVar
 
 # pylint: disable=invalid-name
 T = TypeVar('T')
@@ -16,10 +16,14 @@ T = TypeVar('T')
 async def read_aiter(
         read: Callable[[], Awaitable[None]],
         write: Callable[[], Awaitable[None]],
-        dequeue: Callable[[], Awaitable[T]],
+        dequeue: Callable[[], Awaitable[Iterable[T]]],
         cancellation_event: Event
 ) -> AsyncIterator[T]:
-    """Creates an async iterator from an action."""
+    """Creates an async iterator from an action.
+
+    The dequeue returns every item that is waiting, so a task is created for
+    each batch of items rather than for each item.
+    """
 
     cancellation_task = create_task(cancellation_event.wait())
     read_task = create_task(read())
@@ -42,8 +46,10 @@ async def read_aiter(
                 break
 
             if task.exception() is not None:
+                # The other completed tasks are still handled, so a batch
+                # taken from the queue is not lost.
                 is_faulted = True
-                break
+                continue
 
             if task == read_task:
                 read_task = create_task(read())
@@ -52,7 +58,10 @@ async def read_aiter(
                 write_task = create_task(write())
                 pending.add(write_task)
             elif task == dequeue_task:
-                yield task.result()
+                for item in task.result():
+                    if cancellation_event.is_set():
+                        break
+                    yield item
                 dequeue_task = create_task(dequeue())
                 pending.add(dequeue_task)
 
@@ -35,7 +35,7 @@ class MockStreamWriter:
             extra_info: Any = None,
             close_wait_time: float = 0.01
     ) -> None:
-        self.buf = b''
+        self._buf = bytearray()
         self._closing = False
         self._closed = False
         self._can_write_eof = can_write_eof
@@ -43,6 +43,11 @@ class MockStreamWriter:
         self._extra_info = extra_info
         self.close_wait_time = close_wait_time
 
+    @property
+    def buf(self) -> bytes:
+        """The bytes written so far."""
+        return bytes(self._buf)
+
     def can_write_eof(self) -> bool:
         """Return True if the underlying transport supports the write_eof() method, False otherwise."""
         return self._can_write_eof
@@ -56,11 +61,11 @@ class MockStreamWriter:
 
     def write(self, data: bytes) -> None:
         """Write data to the stream."""
-        self.buf += data
+        self._buf.extend(data)
 
     def writelines(self, data: Iterable[bytes]) -> None:
         for datum in data:
-            self.buf += datum
+            self._buf.extend(datum)
 
     async def drain(self) -> None:
         """Wait until it is appropriate to resume writing to the stream"""
@@ -81,15 +86,19 @@ class MockStreamWriter:
 class MockStreamReader:
     """A Mock for asyncio.StreamReader"""
 
-    def __init__(self, buf: bytes)->None:
+    def __init__(self, buf: bytes, max_read: Optional[int] = None)->None:
         self.buf = buf
         self.offset = 0
+        self.max_read = max_read
 
     async def read(self, n: int = -1) -> bytes:
         """Read up to n bytes. If n is not provided, or set to -1, read until EOF and return all read bytes."""
         if self.at_eof():
             raise EOFError()
 
+        if self.max_read is not None and (n == -1 or n > self.max_read):
+            n = self.max_read
+
         if n == -1:
             data = self.buf[self.offset:]
             self.offset = len(self.buf)
@@ -106,12 +115,9 @@ class MockStreamReader:
             raise EOFError()
 
         start = self.offset
-        for c in self.buf[start:]:
-            self.offset += 1
-            if c == b'\n':
-                break
-
-        return self.buf[start: self.offset]
+        end = self.buf.find(b'\n', start)
+        self.offset = len(self.buf) if end == -1 else end + 1
+        return self.buf[start:self.offset]
 
     async def readexactly(self, n: int) -> bytes:
         """Read exactly n bytes."""
@@ -0,0 +1,97 @@
+"""Tests for the client"""
+
+import asyncio
+from uuid import UUID
+
+import pytest
+
+from jetblack_messagebus import CallbackClient
+from jetblack_messagebus.io import DataReader, DataWriter
+from jetblack_messagebus.messages import (
+    Message,
+    NotificationRequest,
+    ForwardedSubscriptionRequest
+)
+
+from tests.mock_streams import MockStreamReader, MockStreamWriter
+
+@pytest.mark.asyncio
+async def test_write_yields_between_batches():
+    """Test the writer yields to the event loop between batches"""
+    stream_writer = MockStreamWriter()
+    client = CallbackClient(
+        DataReader(MockStreamReader(b'')),
+        DataWriter(stream_writer),
+        None,
+        False,
+        write_batch_size=100
+    )
+    message = NotificationRequest('feed', True)
+    for _ in range(100):
+        client._enqueue(message)  # pylint: disable=protected-access
+    write_task = asyncio.create_task(
+        client._write()  # pylint: disable=protected-access
+    )
+    await asyncio.sleep(0)
+    assert 0 < len(stream_writer.buf) < 1000
+    while len(stream_writer.buf) < 1000:
+        await asyncio.sleep(0)
+    write_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await write_task
+
+
+@pytest.mark.asyncio
+async def test_read_stops_when_queue_full():
+    """Test the reader stops reading while the handlers are behind"""
+    message = ForwardedSubscriptionRequest(
+        'user',
+        'host',
+        UUID('6f2b3e9c-1a4d-4c8e-9f0a-2b7d5e1c3a48'),
+        'feed',
+        'topic',
+        True
+    )
+    stream_writer = MockStreamWriter()
+    await Message.write_many(DataWriter(stream_writer), [message] * 100)
+    stream_reader = MockStreamReader(stream_writer.buf, max_read=64)
+
+    client = CallbackClient(
+        DataReader(stream_reader),
+        DataWriter(MockStreamWriter()),
+        None,
+        False,
+        max_read_queue=10
+    )
+    received = []
+    is_blocked = asyncio.Event()
+    can_continue = asyncio.Event()
+
+    async def on_notification(*args):
+        received.append(args)
+        is_blocked.set()
+        await can_continue.wait()
+
+    closed = []
+
+    async def on_closed(is_faulted):
+        closed.append(is_faulted)
+
+    client.notification_handlers.append(on_notification)
+    client.closed_handlers.append(on_closed)
+    start_task = asyncio.create_task(client.start())
+
+    await is_blocked.wait()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    # One batch is being handled, and the reader has stopped with a full
+    # queue.
+    assert len(received) == 1
+    assert len(client._read_queue) == 10  # pylint: disable=protected-access
+    assert stream_reader.offset < len(stream_writer.buf)
+
+    can_continue.set()
+    await start_task
+    # The messages queued when the connection closed are still handled.
+    assert len(received) == 100
+    assert closed == [True]
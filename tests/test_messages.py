@@ -10,6 +10,7 @@ from jetblack_messagebus.io import (
 )
 from jetblack_messagebus.messages import (
     Message,
+    MessageType,
     MulticastData,
     UnicastData,
     ForwardedSubscriptionRequest,
@@ -29,7 +30,7 @@ async def test_multicast_data():
     source = MulticastData(
         'feed',
         'topic',
-        True,
+        'text/plain',
         [
             DataPacket({1, 2}, b'first'),
             DataPacket(None, b'second'),
@@ -50,7 +51,7 @@ async def test_unicast_data():
         uuid.UUID('12345678123456781234567812345678'),
         'feed',
         'topic',
-        True,
+        'text/plain',
         [
             DataPacket({1, 2}, b'first'),
             DataPacket(None, b'second'),
@@ -158,7 +159,7 @@ async def test_forwarded_multicast_data():
         'host',
         'feed',
         'topic',
-        True,
+        'text/plain',
         [
             DataPacket({1, 2}, b'first'),
             DataPacket(None, b'second'),
@@ -181,7 +182,7 @@ async def test_forwarded_unicast_data():
         uuid.UUID('12345678123456781234567812345678'),
         'feed',
         'topic',
-        True,
+        'text/plain',
         [
             DataPacket({1, 2}, b'first'),
             DataPacket(None, b'second'),
@@ -194,3 +195,132 @@ async def test_forwarded_unicast_data():
     data_reader = DataReader(stream_reader)
     dest = await Message.read(data_reader)
     assert source == dest
+
+@pytest.mark.asyncio
+async def test_write_many():
+    """Test writing a batch of messages"""
+    sources = [
+        NotificationRequest('feed', True),
+        SubscriptionRequest('feed', 'topic', True),
+        UnicastData(uuid.uuid4(), 'feed', 'topic', 'text/plain', None),
+    ]
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    await Message.write_many(data_writer, sources)
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    for source in sources:
+        dest = await Message.read(data_reader)
+        assert source == dest
+
+def test_message_slots_and_repr():
+    """Test messages have no instance dictionary and a generated repr"""
+    message = SubscriptionRequest('feed', 'topic', True)
+    assert not hasattr(message, '__dict__')
+    assert repr(message) == (
+        "SubscriptionRequest(feed='feed', topic='topic', is_add=True)"
+    )
+    assert message != NotificationRequest('feed', True)
+
+@pytest.mark.asyncio
+async def test_read_across_partial_reads():
+    """Test messages split across reads from the stream"""
+    sources = [
+        ForwardedMulticastData(
+            'user',
+            'host',
+            'feed',
+            'topic',
+            'text/plain',
+            [
+                DataPacket({1, 2}, b'first'),
+                DataPacket(None, bytes(2000)),
+            ]
+        ),
+        NotificationRequest('feed', True),
+    ]
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    await Message.write_many(data_writer, sources)
+    stream_reader = MockStreamReader(stream_writer.buf, max_read=7)
+    data_reader = DataReader(stream_reader)
+    for source in sources:
+        dest = await Message.read(data_reader)
+        assert source == dest
+
+@pytest.mark.asyncio
+async def test_invalid_message_type():
+    """Test an unknown header is rejected"""
+    stream_reader = MockStreamReader(b'\x0a')
+    data_reader = DataReader(stream_reader)
+    with pytest.raises(RuntimeError):
+        await Message.read(data_reader)
+
+def test_message_type_requires_schema():
+    """Test a message type without a schema is rejected"""
+    with pytest.raises(TypeError):
+        class NoSchema(Message):  # pylint: disable=unused-variable
+            """A message with no schema"""
+            __slots__ = ()
+            message_type = MessageType.MULTICAST_DATA
+
+@pytest.mark.asyncio
+async def test_message_headers():
+    """Test each message is written with the header for its type"""
+    client_id = uuid.uuid4()
+    sources = [
+        (1, MulticastData('feed', 'topic', 'text/plain', None)),
+        (2, UnicastData(client_id, 'feed', 'topic', 'text/plain', None)),
+        (3, ForwardedSubscriptionRequest(
+            'user', 'host', client_id, 'feed', 'topic', True)),
+        (4, NotificationRequest('feed', True)),
+        (5, SubscriptionRequest('feed', 'topic', True)),
+        (6, AuthorizationRequest(client_id, 'host', 'user', 'feed', 'topic')),
+        (7, AuthorizationResponse(client_id, 'feed', 'topic', True, None)),
+        (8, ForwardedMulticastData(
+            'user', 'host', 'feed', 'topic', 'text/plain', None)),
+        (9, ForwardedUnicastData(
+            'user', 'host', client_id, 'feed', 'topic', 'text/plain', None)),
+    ]
+    for header, source in sources:
+        stream_writer = MockStreamWriter()
+        data_writer = DataWriter(stream_writer)
+        await source.write(data_writer)
+        assert stream_writer.buf[0] == header
+        stream_reader = MockStreamReader(stream_writer.buf)
+        data_reader = DataReader(stream_reader)
+        dest = await Message.read(data_reader)
+        assert type(dest) is type(source)
+        assert source == dest
+
+class CountingDataReader(DataReader):
+    """A data reader which counts the data packets parsed"""
+
+    def __init__(self, reader) -> None:
+        super().__init__(reader)
+        self.packets_parsed = 0
+
+    def read_data_packet_nowait(self) -> DataPacket:
+        self.packets_parsed += 1
+        return super().read_data_packet_nowait()
+
+@pytest.mark.asyncio
+async def test_message_across_many_reads_is_not_reparsed():
+    """Test a message arriving over many reads is parsed in linear time"""
+    count = 500
+    source = ForwardedMulticastData(
+        'user',
+        'host',
+        'feed',
+        'topic',
+        'text/plain',
+        [DataPacket({1}, bytes(100)) for _ in range(count)]
+    )
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    await source.write(data_writer)
+    stream_reader = MockStreamReader(stream_writer.buf, max_read=1000)
+    data_reader = CountingDataReader(stream_reader)
+    dest = await Message.read(data_reader)
+    assert source == dest
+    assert data_reader.packets_parsed < 3 * count
@@ -1,9 +1,10 @@
 """Test Serialization"""
 
+import array
 import uuid
 import pytest
 
-from jetblack_messagebus.io import DataReader, DataWriter
+from jetblack_messagebus.io import DataReader, DataWriter, DataPacket
 
 from tests.mock_streams import MockStreamReader, MockStreamWriter
 
@@ -18,6 +19,7 @@ async def test_roundtrip():
     data_writer.write_int(42)
     data_writer.write_string('This is not a test')
     data_writer.write_uuid(uuid.UUID('12345678123456781234567812345678'))
+    data_writer.flush()
     stream_reader = MockStreamReader(stream_writer.buf)
     data_reader = DataReader(stream_reader)
     assert await data_reader.read_boolean()
@@ -26,3 +28,167 @@ async def test_roundtrip():
     assert await data_reader.read_int() == 42
     assert await data_reader.read_string() == 'This is not a test'
     assert await data_reader.read_uuid() == uuid.UUID('12345678123456781234567812345678')
+
+@pytest.mark.asyncio
+async def test_non_ascii_strings():
+    """Test strings are prefixed with their encoded length"""
+    long_value = 'caf\u00e9 ' * 100
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_string('caf\u00e9')
+    data_writer.write_string(long_value)
+    data_writer.write_int(42)
+    data_writer.flush()
+    assert stream_writer.buf[:9] == b'\x00\x00\x00\x05caf\xc3\xa9'
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    assert await data_reader.read_string() == 'caf\u00e9'
+    assert await data_reader.read_string() == long_value
+    assert await data_reader.read_int() == 42
+
+@pytest.mark.asyncio
+async def test_data_packet_array_roundtrip():
+    """Test round trip serialization of data packets"""
+    packets = [
+        DataPacket({1, 2, 3}, b'first'),
+        DataPacket(None, b'second'),
+        DataPacket({4}, None),
+    ]
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_int_set({10, 20})
+    data_writer.write_data_packet_array(packets)
+    data_writer.write_data_packet_array(None)
+    data_writer.flush()
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    assert await data_reader.read_int_set() == {10, 20}
+    assert await data_reader.read_data_packet_array() == packets
+    assert await data_reader.read_data_packet_array() is None
+
+@pytest.mark.asyncio
+async def test_repeated_strings_are_shared():
+    """Test that repeated strings are read as the same object"""
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_string('topic')
+    data_writer.write_string('topic')
+    data_writer.flush()
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    first = await data_reader.read_string()
+    second = await data_reader.read_string()
+    assert first == 'topic'
+    assert first is second
+
+@pytest.mark.asyncio
+async def test_memoryview_data_packet():
+    """Test a data packet can be written from a memoryview"""
+    buf = b'header:payload'
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    source = DataPacket(None, memoryview(buf)[7:])
+    assert isinstance(source.raw_data, memoryview)
+    data_writer.write_data_packet(source)
+    data_writer.flush()
+    assert source.data == b'payload'
+    assert isinstance(source.data, bytes)
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    packet = await data_reader.read_data_packet()
+    assert packet.data == b'payload'
+
+@pytest.mark.asyncio
+async def test_read_across_partial_reads():
+    """Test values split across reads from the stream"""
+    packets = [DataPacket({1, 2}, b'first'), DataPacket(None, b'second')]
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_string('This is not a test')
+    data_writer.write_data_packet_array(packets)
+    data_writer.write_int(42)
+    data_writer.flush()
+    stream_reader = MockStreamReader(stream_writer.buf, max_read=3)
+    data_reader = DataReader(stream_reader)
+    assert await data_reader.read_string() == 'This is not a test'
+    assert await data_reader.read_data_packet_array() == packets
+    assert await data_reader.read_int() == 42
+    with pytest.raises(EOFError):
+        await data_reader.read_int()
+
+@pytest.mark.asyncio
+async def test_large_data_packets():
+    """Test large payloads are written without being buffered"""
+    large = bytes(range(256)) * 64
+    numbers = array.array('d', range(1024))
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_data_packet_array([
+        DataPacket({1}, large),
+        DataPacket(None, memoryview(numbers)),
+        DataPacket(None, b'small'),
+    ])
+    assert data_writer.buffered == len(large) + len(numbers.tobytes()) + 37
+    data_writer.flush()
+    assert data_writer.buffered == 0
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    packets = await data_reader.read_data_packet_array()
+    assert packets == [
+        DataPacket({1}, large),
+        DataPacket(None, numbers.tobytes()),
+        DataPacket(None, b'small'),
+    ]
+
+@pytest.mark.asyncio
+async def test_deferred_data_packet():
+    """Test large payloads are only copied from the read buffer on access"""
+    large = bytes(range(256)) * 16
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_data_packet(DataPacket({1}, large))
+    data_writer.flush()
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    packet = await data_reader.read_data_packet()
+    assert packet.entitlements == {1}
+    data = packet.data
+    assert isinstance(data, bytes)
+    assert data == large
+    assert packet.data is data
+
+@pytest.mark.asyncio
+async def test_forward_deferred_data_packet():
+    """Test a packet that has been read can be written without its data
+    being accessed"""
+    large = bytes(range(256)) * 16
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_data_packet(DataPacket({1}, large))
+    data_writer.flush()
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    packet = await data_reader.read_data_packet()
+    assert isinstance(packet.raw_data, memoryview)
+    forward_writer = MockStreamWriter()
+    data_writer = DataWriter(forward_writer)
+    data_writer.write_data_packet(packet)
+    data_writer.flush()
+    assert forward_writer.buf == stream_writer.buf
+
+@pytest.mark.asyncio
+async def test_mutable_large_data_packet():
+    """Test a large mutable payload can be reused once it is written"""
+    large = bytearray(range(256)) * 64
+    stream_writer = MockStreamWriter()
+    data_writer = DataWriter(stream_writer)
+    data_writer.write_data_packet(DataPacket(None, large))
+    data_writer.write_data_packet(DataPacket(None, memoryview(large)))
+    expected = bytes(large)
+    large[:] = bytes(len(large))
+    data_writer.flush()
+    stream_reader = MockStreamReader(stream_writer.buf)
+    data_reader = DataReader(stream_reader)
+    for _ in range(2):
+        packet = await data_reader.read_data_packet()
+        assert packet.data == expected